@@ -2,14 +2,48 @@ import ccxt
 import hmac
 import hashlib
 import time
-from typing import Dict, Optional, List, Tuple
+import functools
+import itertools
+from datetime import datetime
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, List, Tuple, Union
 from urllib.parse import urlencode
 import logging
+import numbers
+import re
 import requests
-import base64
+from requests.adapters import HTTPAdapter
 import nacl.signing
 import json
 
+# 优先使用 SIMD 加速的 pybase64，未安装时回退到标准库 base64
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+# 优先使用 orjson 进行 JSON 序列化/反序列化，未安装时回退到标准库 json
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = lambda obj: json.dumps(obj).encode('utf-8')
+    _json_loads = json.loads
+
+# 可选使用 msgspec 将行情响应直接解码为带类型的结构体，未安装时使用通用解析
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# 优先使用 cryptography (OpenSSL) 的 Ed25519 实现，签名速度更快；未安装时回退到 PyNaCl
+try:
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+except ImportError:
+    Ed25519PrivateKey = None
+
 # 配置日志
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)  # 设置日志级别为DEBUG
@@ -25,6 +59,56 @@ console_handler.setFormatter(formatter)
 # 添加处理器到日志记录器
 logger.addHandler(console_handler)
 
+if msgspec is not None:
+    class _TickerResponse(msgspec.Struct):
+        """行情响应结构（数值字段保留原始值，与通用解析使用相同的浮点转换）"""
+        symbol: str
+        lastPrice: Union[str, float, None] = None
+        bidPrice: Union[str, float, None] = None
+        askPrice: Union[str, float, None] = None
+        volume: Union[str, float, None] = None
+        high: Union[str, float, None] = None
+        low: Union[str, float, None] = None
+        priceChange: Union[str, float, None] = None
+
+    _ticker_decoder = msgspec.json.Decoder(_TickerResponse)
+
+# 行情和订单响应中需要转换为浮点数的字段
+_TICKER_FLOAT_KEYS = ('lastPrice', 'bidPrice', 'askPrice', 'volume', 'high', 'low', 'priceChange')
+_ORDER_FLOAT_KEYS = ('price', 'quantity', 'executedQuantity', 'executedQuoteQuantity')
+
+# ISO 8601 时间戳中的小数秒部分
+_FRACTION_RE = re.compile(r'\.(\d+)')
+
+def _parse_iso_datetime(timestamp_str: str) -> datetime:
+    """
+    解析 ISO 8601 时间戳，小数秒补齐或截断为 6 位（Python 3.10 的 fromisoformat 只接受 3 或 6 位）
+    :param timestamp_str: ISO 8601 格式的时间字符串
+    :return: datetime 对象
+    """
+    if timestamp_str.endswith('Z'):
+        timestamp_str = timestamp_str[:-1] + '+00:00'
+    timestamp_str = _FRACTION_RE.sub(lambda m: '.' + (m.group(1) + '000000')[:6], timestamp_str, count=1)
+    return datetime.fromisoformat(timestamp_str)
+
+@functools.lru_cache(maxsize=4096)
+def _split_symbol(symbol: str) -> Tuple[str, str]:
+    """
+    拆分交易对为基础货币和计价货币（结果缓存，交易对列表很少变化）
+    :param symbol: 交易对
+    :return: (基础货币, 计价货币)
+    """
+    # 尝试不同的分隔符
+    if '-' in symbol:
+        base, quote = symbol.split('-')
+    elif '_' in symbol:
+        base, quote = symbol.split('_')
+    else:
+        # 如果没有分隔符，尝试从最后4个字符分割（假设是USDC）
+        base = symbol[:-4]
+        quote = symbol[-4:]
+    return base, quote
+
 class BackpackExchange(ccxt.Exchange):
     def __init__(self, config: Dict):
         super().__init__(config)
@@ -33,104 +117,181 @@ class BackpackExchange(ccxt.Exchange):
         self.baseUrl = 'https://api.backpack.exchange'
         self.timeout = 30000  # 30秒超时
         
+        # 缓存签名函数，避免每次请求重复解码私钥和构造签名对象
+        self._sign_message = self._create_signer(self.secret) if self.secret else None
+        
+        # 预先构建请求头模板，签名和时间戳预留占位，每次请求只需复制后覆盖这两个字段
+        # 模板本身不可原地修改：签名可能在多个线程中并发进行
+        self._window = '5000'  # 5秒时间窗口
+        self._window_part = f"&window={self._window}".encode()
+        self._header_template = {
+            'X-API-KEY': self.apiKey,
+            'X-SIGNATURE': '',
+            'X-TIMESTAMP': '',
+            'X-WINDOW': self._window,
+            'Content-Type': 'application/json'
+        }
+        
+        # clientId 计数器，以当前时间戳的后 8 位为起点，避免高频下单时重复
+        # itertools.count 的 next() 在 GIL 下是原子的，可在多线程下单时安全使用
+        self._client_ids = itertools.count(self._get_timestamp() % 100000000)
+        
         # 配置请求会话
         self.session = requests.Session()
         self.session.verify = True  # 启用 SSL 验证
+        # 扩大连接池，复用长连接以支持并发下单/撤单
+        self.session.mount('https://', HTTPAdapter(pool_connections=32, pool_maxsize=64))
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
 
+    @staticmethod
+    def _create_signer(secret: str):
+        """
+        根据私钥创建 ED25519 签名函数
+        :param secret: Base64 编码的私钥
+        :return: 接收消息字节并返回 64 字节签名的函数
+        """
+        seed = base64.b64decode(secret)
+        if Ed25519PrivateKey is not None:
+            return Ed25519PrivateKey.from_private_bytes(seed).sign
+        signing_key = nacl.signing.SigningKey(seed)
+        return lambda message: signing_key.sign(message).signature
+
+    @staticmethod
+    def _format_number(value) -> str:
+        """
+        将数字格式化为不含科学计数法的十进制字符串
+        :param value: 数字或已格式化的字符串
+        :return: 格式化后的字符串
+        """
+        if isinstance(value, str):
+            return value
+        if isinstance(value, Decimal):
+            return format(value, 'f')
+        if isinstance(value, numbers.Integral):
+            return format(Decimal(int(value)), 'f')
+        # repr 给出能还原该浮点数的最短表示，再经 Decimal 展开为定点格式
+        # 先转为内置 float：NumPy 2 中 repr(np.float64(1.5)) 为 'np.float64(1.5)'
+        return format(Decimal(repr(float(value))), 'f')
+
     def _get_timestamp(self) -> int:
         """获取当前时间戳(毫秒)"""
-        return int(time.time() * 1000)
+        return time.time_ns() // 1_000_000
 
-    def _sign_request(self, method: str, path: str, params: Optional[Dict] = None, data: Optional[Dict] = None, instruction: Optional[str] = None) -> Tuple[str, Dict]:
+    def _sign_payload(self, payload: str, instruction: Optional[str] = None) -> Tuple[str, Dict]:
         """
-        生成请求签名
-        :param method: 请求方法
-        :param path: 请求路径
-        :param params: 查询参数
-        :param data: 请求体数据
+        对已序列化的参数签名并生成请求头
+        :param payload: 排序后的请求体或查询字符串
         :param instruction: 指令类型
         :return: 签名和请求头
         """
         # 生成时间戳
-        timestamp = str(int(time.time() * 1000))
-        window = "5000"  # 5秒时间窗口
+        timestamp = str(self._get_timestamp())
+        window = self._window
         
-        # 准备签名字符串
-        signature_parts = []
+        # 准备签名字符串，在同一个字节缓冲区中依次追加各部分
+        message = bytearray()
         
         # 添加指令类型（如果有）
         if instruction:
-            signature_parts.append(f"instruction={instruction}")
+            message += b"instruction="
+            message += instruction.encode()
+            message += b"&"
         
-        # 添加请求体数据（如果有）
-        if data:
-            # 对数据进行排序
-            sorted_data = sorted(data.items(), key=lambda x: x[0])
-            # 构建数据字符串，处理布尔值
-            data_string = "&".join([
-                f"{k}={str(v).lower() if isinstance(v, bool) else v}" 
-                for k, v in sorted_data
-            ])
-            signature_parts.append(data_string)
-        
-        # 添加查询参数（如果有）
-        if params:
-            # 对参数进行排序
-            sorted_params = sorted(params.items(), key=lambda x: x[0])
-            # 构建查询字符串，处理列表类型的参数
-            query_parts = []
-            for k, v in sorted_params:
-                if isinstance(v, list):
-                    # 对于列表类型的参数，将每个元素单独添加
-                    for item in v:
-                        query_parts.append(f"{k}={item}")
-                else:
-                    query_parts.append(f"{k}={v}")
-            query_string = "&".join(query_parts)
-            signature_parts.append(query_string)
+        # 添加请求体数据或查询参数（如果有）
+        if payload:
+            message += payload.encode()
+            message += b"&"
         
         # 添加时间戳和窗口
-        signature_parts.append(f"timestamp={timestamp}")
-        signature_parts.append(f"window={window}")
-        
-        # 构建完整的签名字符串
-        signature_data = "&".join(signature_parts)
+        message += b"timestamp="
+        message += timestamp.encode()
+        message += self._window_part
         
         # 使用 ED25519 生成签名
-        private_key = base64.b64decode(self.secret)
-        message = signature_data.encode('utf-8')
-        signature = nacl.signing.SigningKey(private_key).sign(message).signature
+        signature = self._sign_message(bytes(message))
         
         # Base64 编码签名
-        signature_b64 = base64.b64encode(signature).decode('utf-8')
+        signature_b64 = base64.b64encode(signature).decode('ascii')
         
         # 准备请求头
-        headers = {
-            'X-API-KEY': self.apiKey,
-            'X-SIGNATURE': signature_b64,
-            'X-TIMESTAMP': timestamp,
-            'X-WINDOW': window,
-            'Content-Type': 'application/json'
-        }
+        headers = self._header_template.copy()
+        headers['X-SIGNATURE'] = signature_b64
+        headers['X-TIMESTAMP'] = timestamp
         
         # 记录调试信息
-        logger.debug("签名信息:")
-        logger.debug(f"时间戳: {timestamp}")
-        logger.debug(f"时间窗口: {window}")
-        logger.debug(f"方法: {method}")
-        logger.debug(f"路径: {path}")
-        logger.debug(f"查询参数: {params}")
-        logger.debug(f"请求体数据: {data}")
-        logger.debug(f"指令类型: {instruction}")
-        logger.debug(f"签名字符串: {signature_data}")
-        logger.debug(f"签名: {signature_b64}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("签名信息:")
+            logger.debug(f"时间戳: {timestamp}")
+            logger.debug(f"时间窗口: {window}")
+            logger.debug(f"指令类型: {instruction}")
+            logger.debug(f"签名字符串: {message.decode()}")
+            logger.debug(f"签名: {signature_b64}")
         
         return signature_b64, headers
 
-    def _request(self, method: str, path: str, params: Dict = None, data: Dict = None, instruction: str = None) -> Dict:
+    @staticmethod
+    def _serialize_data(data: Dict) -> str:
+        """按键排序序列化请求体数据，布尔值转为小写"""
+        # 先统一转换布尔值，再排序拼接
+        normalized = {k: ('true' if v is True else 'false' if v is False else v) for k, v in data.items()}
+        return "&".join([f"{k}={v}" for k, v in sorted(normalized.items())])
+
+    @staticmethod
+    def _serialize_params(params: Dict) -> str:
+        """按键排序构建查询字符串，doseq 将列表类型的参数展开为多个键值对"""
+        return urlencode(sorted(params.items()), doseq=True, safe=',:')
+
+    def _sign_get(self, path: str, params: Optional[Dict] = None, instruction: Optional[str] = None) -> Tuple[str, Dict, str]:
+        """
+        生成只带查询参数的请求签名
+        :param path: 请求路径
+        :param params: 查询参数
+        :param instruction: 指令类型
+        :return: 签名、请求头和查询字符串
+        """
+        query_string = self._serialize_params(params) if params else ''
+        signature_b64, headers = self._sign_payload(query_string, instruction)
+        return signature_b64, headers, query_string
+
+    def _sign_post(self, path: str, data: Dict, instruction: Optional[str] = None) -> Tuple[str, Dict, str]:
+        """
+        生成只带请求体数据的请求签名
+        :param path: 请求路径
+        :param data: 请求体数据
+        :param instruction: 指令类型
+        :return: 签名、请求头和空查询字符串
+        """
+        signature_b64, headers = self._sign_payload(self._serialize_data(data), instruction)
+        return signature_b64, headers, ''
+
+    def _sign_request(self, method: str, path: str, params: Optional[Dict] = None, data: Optional[Dict] = None, instruction: Optional[str] = None) -> Tuple[str, Dict, str]:
+        """
+        生成请求签名（同时带请求体数据和查询参数时使用）
+        :param method: 请求方法
+        :param path: 请求路径
+        :param params: 查询参数
+        :param data: 请求体数据
+        :param instruction: 指令类型
+        :return: 签名、请求头和查询字符串
+        """
+        payload_parts = []
+        
+        # 添加请求体数据（如果有）
+        if data:
+            payload_parts.append(self._serialize_data(data))
+        
+        # 添加查询参数（如果有），查询字符串同时用于构建请求URL
+        query_string = ''
+        if params:
+            query_string = self._serialize_params(params)
+            payload_parts.append(query_string)
+        
+        signature_b64, headers = self._sign_payload("&".join(payload_parts), instruction)
+        return signature_b64, headers, query_string
+
+    def _request(self, method: str, path: str, params: Dict = None, data: Dict = None, instruction: str = None, decoder: Optional[Callable] = None) -> Dict:
         """
         发送请求
         :param method: 请求方法
@@ -138,52 +299,52 @@ class BackpackExchange(ccxt.Exchange):
         :param params: URL参数
         :param data: 请求体数据
         :param instruction: 指令类型
+        :param decoder: 响应解码函数，接收原始响应字节，提供时直接返回解码结果
         :return: 响应数据
         """
         try:
-            # 生成签名和请求头
-            sign_data = self._sign_request(method, path, params, data, instruction)
+            # 生成签名和请求头，常见的只带查询参数或只带请求体的请求走专用路径
+            if not data:
+                sign_data = self._sign_get(path, params, instruction)
+            elif not params:
+                sign_data = self._sign_post(path, data, instruction)
+            else:
+                sign_data = self._sign_request(method, path, params, data, instruction)
             
-            # 构建完整URL
+            # 构建完整URL，复用签名时生成的查询字符串
             url = f"{self.baseUrl}{path}"
-            if params:
-                # 处理列表类型的参数
-                query_parts = []
-                for k, v in sorted(params.items()):
-                    if isinstance(v, list):
-                        # 对于列表类型的参数，将每个元素单独添加
-                        for item in v:
-                            query_parts.append(f"{k}={item}")
-                    else:
-                        query_parts.append(f"{k}={v}")
-                query_string = '&'.join(query_parts)
-                url = f"{url}?{query_string}"
+            if sign_data[2]:
+                url = f"{url}?{sign_data[2]}"
             
             # 记录请求信息
-            logger.debug(f"发送请求:")
-            logger.debug(f"URL: {url}")
-            logger.debug(f"方法: {method}")
-            logger.debug(f"参数: {params}")
-            logger.debug(f"数据: {data}")
-            logger.debug(f"指令类型: {instruction}")
-            logger.debug(f"请求头: {sign_data[1]}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"发送请求:")
+                logger.debug(f"URL: {url}")
+                logger.debug(f"方法: {method}")
+                logger.debug(f"参数: {params}")
+                logger.debug(f"数据: {data}")
+                logger.debug(f"指令类型: {instruction}")
+                logger.debug(f"请求头: {sign_data[1]}")
             
             # 发送请求
             response = self.session.request(
                 method=method,
                 url=url,
                 headers=sign_data[1],
-                json=data,
+                data=_json_dumps(data) if data is not None else None,
                 verify=True
             )
             # 记录响应信息
-            logger.debug(f"响应状态码: {response.status_code}")
-            logger.debug(f"响应头: {response.headers}")
-            logger.debug(f"响应内容: {response.text}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"响应状态码: {response.status_code}")
+                logger.debug(f"响应头: {response.headers}")
+                logger.debug(f"响应内容: {response.text}")
             
             # 检查响应状态
             if response.status_code == 200:
-                return response.json()
+                if decoder is not None:
+                    return decoder(response.content)
+                return _json_loads(response.content)
             elif response.status_code == 401:
                 raise Exception("API认证失败，请检查API密钥和签名")
             elif response.status_code == 403:
@@ -209,8 +370,7 @@ class BackpackExchange(ccxt.Exchange):
         """获取当前行情信息"""
         path = '/api/v1/ticker'
         params = {'symbol': symbol}
-        response = self._request('GET', path, params)
-        return self._parse_ticker(response)
+        return self._request('GET', path, params, decoder=self._decode_ticker)
 
     def create_order(self, symbol: str, type: str, side: str, amount: float, 
                     price: Optional[float] = None, is_futures: bool = False,
@@ -271,8 +431,7 @@ class BackpackExchange(ccxt.Exchange):
             
         # 生成唯一的 clientId (确保在 uint32 范围内)
         if client_id is None:
-            # 使用当前时间戳的后 8 位数字作为 clientId
-            client_id = int(time.time() * 1000) % 100000000
+            client_id = next(self._client_ids) % 100000000
             
         # 准备请求体数据
         order_data = {
@@ -290,34 +449,33 @@ class BackpackExchange(ccxt.Exchange):
         if type.lower() == 'limit' and post_only:
             order_data['postOnly'] = post_only
         
-        # 添加可选参数
-        if price:
-            order_data['price'] = str(price)
-        if quote_quantity:
-            order_data['quoteQuantity'] = str(quote_quantity)
-        if stop_loss_limit_price:
-            order_data['stopLossLimitPrice'] = str(stop_loss_limit_price)
+        # 添加可选的数值参数
+        for key, value in (
+            ('price', price),
+            ('quoteQuantity', quote_quantity),
+            ('stopLossLimitPrice', stop_loss_limit_price),
+            ('stopLossTriggerPrice', stop_loss_trigger_price),
+            ('takeProfitLimitPrice', take_profit_limit_price),
+            ('takeProfitTriggerPrice', take_profit_trigger_price),
+            ('triggerPrice', trigger_price)
+        ):
+            if value:
+                order_data[key] = self._format_number(value)
+        
+        # 添加可选的字符串参数
         if stop_loss_trigger_by:
             order_data['stopLossTriggerBy'] = stop_loss_trigger_by
-        if stop_loss_trigger_price:
-            order_data['stopLossTriggerPrice'] = str(stop_loss_trigger_price)
-        if take_profit_limit_price:
-            order_data['takeProfitLimitPrice'] = str(take_profit_limit_price)
         if take_profit_trigger_by:
             order_data['takeProfitTriggerBy'] = take_profit_trigger_by
-        if take_profit_trigger_price:
-            order_data['takeProfitTriggerPrice'] = str(take_profit_trigger_price)
         if trigger_by:
             order_data['triggerBy'] = trigger_by
-        if trigger_price:
-            order_data['triggerPrice'] = str(trigger_price)
         if trigger_quantity:
             order_data['triggerQuantity'] = trigger_quantity
             
         # 合约订单特有参数
         if is_futures:
             if leverage:
-                order_data['leverage'] = str(leverage)
+                order_data['leverage'] = self._format_number(leverage)
             if margin_type:
                 order_data['marginType'] = margin_type.lower()
                 
@@ -335,8 +493,7 @@ class BackpackExchange(ccxt.Exchange):
         # 记录订单数据
         logger.info(f"创建订单数据: {order_data}")
         
-        response = self._request('POST', path, data=order_data, instruction='orderExecute')
-        return self._parse_order(response)
+        return self._request('POST', path, data=order_data, instruction='orderExecute', decoder=self._decode_order)
 
     def cancel_order(self, order_id: str, symbol: str) -> Dict:
         """
@@ -383,11 +540,7 @@ class BackpackExchange(ccxt.Exchange):
         
         # 发送请求
         logger.info(f"获取订单信息 - {params}")
-        response = self._request('GET', path, params, instruction='orderQuery')
-        
-        if response:
-            return self._parse_order(response)
-        return None
+        return self._request('GET', path, params, instruction='orderQuery', decoder=self._decode_order_or_none)
 
     def fetch_order_by_client_id(self, client_id: int, symbol: str, is_futures: bool = False) -> Dict:
         """
@@ -406,21 +559,19 @@ class BackpackExchange(ccxt.Exchange):
         }
         
         # 发送请求
-        response = self._request('GET', path, params, instruction='orderQuery')
-        
-        if response:
-            return self._parse_order(response)
-        return None
+        return self._request('GET', path, params, instruction='orderQuery', decoder=self._decode_order_or_none)
 
     def fetch_markets(self) -> List[Dict]:
         """获取所有可用的交易对"""
-        # 获取现货交易对
         spot_path = '/api/v1/markets'
-        spot_response = self._request('GET', spot_path)
-        
-        # 获取合约交易对
         futures_path = '/api/v1/futures/markets'
-        futures_response = self._request('GET', futures_path)
+        
+        # 并发获取现货和合约交易对
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            spot_future = executor.submit(self._request, 'GET', spot_path)
+            futures_future = executor.submit(self._request, 'GET', futures_path)
+            spot_response = spot_future.result()
+            futures_response = futures_future.result()
         
         # 合并并解析所有交易对
         all_markets = []
@@ -435,9 +586,9 @@ class BackpackExchange(ccxt.Exchange):
         """
         try:
             # 获取账户资金信息
-            logger.debug(f"获取账户资金信息")
+            logger.debug("获取账户资金信息")
             response = self._request('GET', '/api/v1/capital', instruction='balanceQuery')
-            logger.debug(f"资金信息响应: {response}")
+            logger.debug("资金信息响应: %s", response)
             
             # 处理余额信息
             balances = {}
@@ -456,16 +607,36 @@ class BackpackExchange(ccxt.Exchange):
 
     def _parse_ticker(self, response: Dict) -> Dict:
         """解析行情响应"""
-        # 打印原始响应数据以便调试
+        last, bid, ask, volume, high, low, change = map(lambda k: float(response.get(k) or 0), _TICKER_FLOAT_KEYS)
         return {
             'symbol': response['symbol'],
-            'last': float(response.get('lastPrice', 0)),
-            'bid': float(response.get('bidPrice', 0)),
-            'ask': float(response.get('askPrice', 0)),
-            'volume': float(response.get('volume', 0)),
-            'high': float(response.get('high', 0)),
-            'low': float(response.get('low', 0)),
-            'change': float(response.get('priceChange', 0))
+            'last': last,
+            'bid': bid,
+            'ask': ask,
+            'volume': volume,
+            'high': high,
+            'low': low,
+            'change': change
+        }
+
+    def _decode_ticker(self, content: bytes) -> Dict:
+        """解码行情响应，安装了 msgspec 时跳过中间字典直接解码为结构体"""
+        if msgspec is None:
+            return self._parse_ticker(_json_loads(content))
+        try:
+            ticker = _ticker_decoder.decode(content)
+        except msgspec.ValidationError:
+            # 结构不符时交给通用解析，保证两条路径结果一致
+            return self._parse_ticker(_json_loads(content))
+        return {
+            'symbol': ticker.symbol,
+            'last': float(ticker.lastPrice or 0),
+            'bid': float(ticker.bidPrice or 0),
+            'ask': float(ticker.askPrice or 0),
+            'volume': float(ticker.volume or 0),
+            'high': float(ticker.high or 0),
+            'low': float(ticker.low or 0),
+            'change': float(ticker.priceChange or 0)
         }
 
     def _parse_order(self, order: Dict) -> Dict:
@@ -475,16 +646,17 @@ class BackpackExchange(ccxt.Exchange):
         :return: 解析后的订单信息
         """
         try:
+            price, amount, filled, cost = map(lambda k: float(order.get(k) or 0), _ORDER_FLOAT_KEYS)
             return {
                 'id': order.get('id'),
                 'clientId': order.get('clientId'),
                 'symbol': order.get('symbol'),
                 'side': order.get('side'),
                 'type': order.get('orderType'),
-                'price': float(order.get('price', 0)),
-                'amount': float(order.get('quantity', 0)),
-                'filled': float(order.get('executedQuantity', 0)),
-                'cost': float(order.get('executedQuoteQuantity', 0)),
+                'price': price,
+                'amount': amount,
+                'filled': filled,
+                'cost': cost,
                 'status': order.get('status'),
                 'timeInForce': order.get('timeInForce'),
                 'reduceOnly': order.get('reduceOnly', False),
@@ -506,6 +678,17 @@ class BackpackExchange(ccxt.Exchange):
             logger.error(f"解析订单信息时出错: {str(e)}")
             raise
 
+    def _decode_order(self, content: bytes) -> Dict:
+        """解码订单响应"""
+        return self._parse_order(_json_loads(content))
+
+    def _decode_order_or_none(self, content: bytes) -> Optional[Dict]:
+        """解码订单响应，响应为空时返回 None"""
+        order = _json_loads(content)
+        if order:
+            return self._parse_order(order)
+        return None
+
     def _parse_markets(self, response: List[Dict]) -> List[Dict]:
         """解析交易对信息"""
         markets = []
@@ -515,15 +698,7 @@ class BackpackExchange(ccxt.Exchange):
                 # 打印原始数据以便调试
                 logger.info(f"原始市场数据: {market}")
                 
-                # 尝试不同的分隔符
-                if '-' in symbol:
-                    base, quote = symbol.split('-')
-                elif '_' in symbol:
-                    base, quote = symbol.split('_')
-                else:
-                    # 如果没有分隔符，尝试从最后3个字符分割（假设是USDC）
-                    base = symbol[:-4]
-                    quote = symbol[-4:]
+                base, quote = _split_symbol(symbol)
                 
                 markets.append({
                     'symbol': symbol,
@@ -579,12 +754,16 @@ class BackpackExchange(ccxt.Exchange):
             # 将 ISO 8601 格式的时间戳转换为毫秒时间戳
             timestamp_str = trade.get('timestamp')
             if timestamp_str:
-                # 移除毫秒部分，只保留到秒
-                timestamp_str = timestamp_str.split('.')[0]
-                # 将 ISO 8601 格式转换为时间戳
-                timestamp = int(time.mktime(time.strptime(timestamp_str, '%Y-%m-%dT%H:%M:%S')) * 1000)
+                # 使用 fromisoformat 解析，比 strptime 快且保留毫秒
+                timestamp = int(_parse_iso_datetime(timestamp_str).timestamp() * 1000)
             else:
                 timestamp = None
+            
+            # 每个数值字段只转换一次
+            price = float(trade.get('price'))
+            amount = float(trade.get('quantity'))
+            fee = float(trade.get('fee'))
+            cost = price * amount
                 
             parsed_trade = {
                 'id': str(trade.get('tradeId')),  # 使用 tradeId 作为成交ID
@@ -594,13 +773,13 @@ class BackpackExchange(ccxt.Exchange):
                 'datetime': trade.get('timestamp'),  # 直接使用原始的时间戳字符串
                 'symbol': trade.get('symbol'),
                 'side': 'buy' if trade.get('side') == 'Bid' else 'sell',
-                'price': float(trade.get('price')),
-                'amount': float(trade.get('quantity')),
-                'cost': float(trade.get('price')) * float(trade.get('quantity')),
+                'price': price,
+                'amount': amount,
+                'cost': cost,
                 'fee': {
                     'currency': trade.get('feeSymbol'),
-                    'cost': float(trade.get('fee')),
-                    'rate': float(trade.get('fee')) / (float(trade.get('price')) * float(trade.get('quantity')))
+                    'cost': fee,
+                    'rate': fee / cost
                 },
                 'isMaker': trade.get('isMaker', False),
                 'systemOrderType': trade.get('systemOrderType')
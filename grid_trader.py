@@ -1,9 +1,16 @@
 import os
 import time
 import logging
+import logging.handlers
+import queue
+import atexit
 import signal
 import sys
-from typing import List, Dict
+import functools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Tuple
+import numpy as np
 from decimal import Decimal
 from dotenv import load_dotenv
 from backpack_exchange import BackpackExchange
@@ -13,14 +20,49 @@ from datetime import datetime
 # 加载环境变量
 load_dotenv()
 
-# 配置日志
+# 配置日志：交易线程只把日志记录放入队列，由后台监听线程负责格式化输出
+_log_queue = queue.Queue(-1)
+_console_handler = logging.StreamHandler()
+_console_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s'))
+_log_listener = logging.handlers.QueueListener(_log_queue, _console_handler)
 logging.basicConfig(
     level=os.getenv('LOG_LEVEL', 'INFO'),
-    format='%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s'
+    format='%(message)s',  # 队列端只合并消息参数，完整格式由监听线程的处理器输出
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
+_log_listener.start()
+# backpack_exchange 自带同步的控制台处理器，移除后其日志经根日志记录器进入队列，避免重复且阻塞输出
+_exchange_logger = logging.getLogger('backpack_exchange')
+for _handler in list(_exchange_logger.handlers):
+    if isinstance(_handler, logging.StreamHandler):
+        _exchange_logger.removeHandler(_handler)
+# 退出时（包括 run() 中的 sys.exit）停止监听线程，确保队列中的日志全部输出
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
-@dataclass
+def _compute_grid(lower_price: float, upper_price: float, grid_number: int, geometric: bool,
+                  investment: float, min_order_size: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    计算网格价格和每个网格的订单数量
+    :return: (网格价格, 订单数量)
+    """
+    space = np.geomspace if geometric else np.linspace
+    prices = np.round(space(lower_price, upper_price, grid_number + 1), 2)
+    amounts = np.maximum(np.round((investment / grid_number) / prices, 3), min_order_size)
+    return prices, amounts
+
+def _compute_grid_returns(prices: np.ndarray, amounts: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    计算每个网格的投入、收益和收益率
+    :return: (投入, 收益, 收益率百分比)
+    """
+    buy_prices = prices[:-1]
+    buy_amounts = amounts[:-1]
+    investments = buy_amounts * buy_prices
+    profits = buy_amounts * (prices[1:] - buy_prices)
+    return investments, profits, profits / investments * 100
+
+@dataclass(slots=True)
 class OrderInfo:
     """订单信息类"""
     order_id: str
@@ -29,35 +71,69 @@ class OrderInfo:
     price: float
     amount: float
     status: str  # 'open', 'closed', 'cancelled'
-    created_at: datetime
-    closed_at: datetime = None
+    created_at_ns: int  # 创建时间 (time.time_ns())
+    closed_at_ns: int = None  # 完成时间 (time.time_ns())
     filled_price: float = None
     filled_amount: float = None
     profit: float = None
 
+    @property
+    def created_at(self) -> datetime:
+        """创建时间"""
+        return datetime.fromtimestamp(self.created_at_ns / 1e9)
+
+    @property
+    def closed_at(self) -> datetime:
+        """完成时间"""
+        if self.closed_at_ns is None:
+            return None
+        return datetime.fromtimestamp(self.closed_at_ns / 1e9)
+
 class OrderManager:
     """订单管理器"""
     def __init__(self):
         self.orders: Dict[str, OrderInfo] = {}  # order_id -> OrderInfo
+        # 按状态维护的订单ID索引（用字典保持插入顺序），以及累计利润
+        self._open_ids: Dict[str, None] = {}
+        self._closed_ids: Dict[str, None] = {}
+        self._total_profit = 0.0
+        # 最近完成的订单，用于汇总信息展示
+        self._recent_closed = deque(maxlen=5)
+        
+    def _index_order(self, order_id: str, status: str):
+        """根据订单状态更新ID索引"""
+        self._open_ids.pop(order_id, None)
+        self._closed_ids.pop(order_id, None)
+        if status == 'open':
+            self._open_ids[order_id] = None
+        elif status == 'closed':
+            self._closed_ids[order_id] = None
         
     def add_order(self, order: OrderInfo):
         """添加新订单"""
         self.orders[order.order_id] = order
-        logger.info(f"添加新订单: {order.order_id} - {order.side} {order.amount} @ {order.price}")
+        self._index_order(order.order_id, order.status)
+        logger.info("添加新订单: %s - %s %s @ %s", order.order_id, order.side, order.amount, order.price)
         
     def update_order(self, order_id: str, status: str, filled_price: float = None, filled_amount: float = None):
         """更新订单状态"""
         if order_id in self.orders:
             order = self.orders[order_id]
+            if status == 'closed' and order.status != 'closed':
+                self._recent_closed.append(order)
             order.status = status
+            self._index_order(order_id, status)
             if status in ['closed', 'cancelled']:
-                order.closed_at = datetime.now()
+                order.closed_at_ns = time.time_ns()
             if filled_price and filled_amount:
                 order.filled_price = filled_price
                 order.filled_amount = filled_amount
                 if order.side == 'ask':  # 如果是卖单，计算利润
+                    if order.profit is not None:
+                        self._total_profit -= order.profit
                     order.profit = (filled_price - order.price) * filled_amount
-            logger.info(f"更新订单状态: {order_id} -> {status}")
+                    self._total_profit += order.profit
+            logger.info("更新订单状态: %s -> %s", order_id, status)
             
     def get_order(self, order_id: str) -> OrderInfo:
         """获取订单信息"""
@@ -65,62 +141,121 @@ class OrderManager:
         
     def get_open_orders(self) -> List[OrderInfo]:
         """获取所有未完成订单"""
-        return [order for order in self.orders.values() if order.status == 'open']
+        return [self.orders[order_id] for order_id in self._open_ids]
         
     def get_closed_orders(self) -> List[OrderInfo]:
         """获取所有已完成订单"""
-        return [order for order in self.orders.values() if order.status == 'closed']
+        return [self.orders[order_id] for order_id in self._closed_ids]
         
     def get_total_profit(self) -> float:
         """获取总利润"""
-        return sum(order.profit for order in self.orders.values() if order.profit is not None)
+        return self._total_profit
         
     def print_order_summary(self):
         """打印订单汇总信息"""
-        open_orders = self.get_open_orders()
-        closed_orders = self.get_closed_orders()
-        total_profit = self.get_total_profit()
-        
         logger.info("\n=== 订单汇总信息 ===")
-        logger.info(f"未完成订单数量: {len(open_orders)}")
-        logger.info(f"已完成订单数量: {len(closed_orders)}")
-        logger.info(f"总利润: {total_profit:.2f}")
+        logger.info("未完成订单数量: %d", len(self._open_ids))
+        logger.info("已完成订单数量: %d", len(self._closed_ids))
+        logger.info("总利润: %.2f", self._total_profit)
         
-        if closed_orders:
+        if self._closed_ids:
             logger.info("\n最近完成的订单:")
-            for order in closed_orders[-5:]:  # 显示最近5个完成的订单
-                logger.info(f"订单 {order.order_id}: {order.side} {order.amount} @ {order.price} -> {order.filled_price} | 利润: {order.profit:.2f}")
+            for order in self._recent_closed:  # 显示最近5个完成的订单
+                logger.info("订单 %s: %s %s @ %s -> %s | 利润: %.2f", order.order_id, order.side, order.amount, order.price, order.filled_price, order.profit)
         logger.info("=" * 50)
 
+@dataclass(frozen=True, slots=True)
+class GridConfig:
+    """网格交易配置"""
+    api_key: str
+    api_secret: str
+    symbol: str
+    upper_price: float
+    lower_price: float
+    grid_number: int
+    investment: float
+    grid_type: str  # 'arithmetic' 或 'geometric'
+    min_order_size: float
+    post_only: bool
+    time_in_force: str
+    max_orders: int
+    stop_loss_price: float
+    take_profit_price: float
+    check_interval: int
+
+    @classmethod
+    def from_env(cls) -> 'GridConfig':
+        """从环境变量读取配置"""
+        return cls(
+            api_key=os.getenv('API_KEY'),
+            api_secret=os.getenv('API_SECRET'),
+            symbol=os.getenv('SYMBOL'),
+            upper_price=float(os.getenv('UPPER_PRICE')),
+            lower_price=float(os.getenv('LOWER_PRICE')),
+            grid_number=int(os.getenv('GRID_NUMBER')),
+            investment=float(os.getenv('INVESTMENT')),
+            grid_type=os.getenv('GRID_TYPE'),
+            min_order_size=float(os.getenv('MIN_ORDER_SIZE')),
+            post_only=os.getenv('POST_ONLY').lower() == 'true',
+            time_in_force=os.getenv('TIME_IN_FORCE'),
+            max_orders=int(os.getenv('MAX_ORDERS')),
+            stop_loss_price=float(os.getenv('STOP_LOSS_PRICE')),
+            take_profit_price=float(os.getenv('TAKE_PROFIT_PRICE')),
+            check_interval=int(os.getenv('CHECK_INTERVAL'))
+        )
+
+@functools.lru_cache(maxsize=None)
+def load_grid_config() -> GridConfig:
+    """加载并缓存网格交易配置，进程内只解析一次环境变量"""
+    return GridConfig.from_env()
+
 class GridTrader:
-    def __init__(self):
+    def __init__(self, cfg: GridConfig = None):
+        if cfg is None:
+            cfg = load_grid_config()
+        
         # 初始化交易所
         self.exchange = BackpackExchange({
-            'apiKey': os.getenv('API_KEY'),
-            'secret': os.getenv('API_SECRET')
+            'apiKey': cfg.api_key,
+            'secret': cfg.api_secret
         })
         
         # 初始化订单管理器
         self.order_manager = OrderManager()
         
+        # 余额缓存 (获取时间, 余额)，避免一轮下单中重复请求
+        self._balance_cache = (0.0, None)
+        # 最新价格缓存 (获取时间, 价格)
+        self._last_ticker = (0.0, None)
+        # 未完成订单缓存 (获取时间, 订单列表)，下单或撤单成功后失效
+        self._open_orders_cache = (0.0, None)
+        # 退出标志：收到退出信号后不再提交新的订单，由主循环完成撤单和退出
+        # 使用普通布尔值，信号处理函数中不能获取任何锁（包括 threading.Event 内部的锁）
+        self._stop_requested = False
+        
         # 设置信号处理
         signal.signal(signal.SIGINT, self.signal_handler)
         signal.signal(signal.SIGTERM, self.signal_handler)
         
         # 加载配置
-        self.symbol = os.getenv('SYMBOL')
-        self.upper_price = float(os.getenv('UPPER_PRICE'))
-        self.lower_price = float(os.getenv('LOWER_PRICE'))
-        self.grid_number = int(os.getenv('GRID_NUMBER'))
-        self.investment = float(os.getenv('INVESTMENT'))
-        self.grid_type = os.getenv('GRID_TYPE')
-        self.min_order_size = float(os.getenv('MIN_ORDER_SIZE'))
-        self.post_only = os.getenv('POST_ONLY').lower() == 'true'
-        self.time_in_force = os.getenv('TIME_IN_FORCE')
-        self.max_orders = int(os.getenv('MAX_ORDERS'))
-        self.stop_loss_price = float(os.getenv('STOP_LOSS_PRICE'))
-        self.take_profit_price = float(os.getenv('TAKE_PROFIT_PRICE'))
-        self.check_interval = int(os.getenv('CHECK_INTERVAL'))
+        self.symbol = cfg.symbol
+        # 从交易对中解析基础货币和计价货币
+        try:
+            self.base_currency, self.quote_currency = self.symbol.split('_')
+        except ValueError:
+            raise ValueError(f"交易对格式错误: {self.symbol}，应为 BASE_QUOTE 格式")
+        self.upper_price = cfg.upper_price
+        self.lower_price = cfg.lower_price
+        self.grid_number = cfg.grid_number
+        self.investment = cfg.investment
+        self.grid_type = cfg.grid_type
+        self.min_order_size = cfg.min_order_size
+        self.post_only = cfg.post_only
+        self.time_in_force = cfg.time_in_force
+        self.max_orders = cfg.max_orders
+        self.stop_loss_price = cfg.stop_loss_price
+        self.take_profit_price = cfg.take_profit_price
+        self.check_interval = cfg.check_interval
         
         # 初始化网格价格列表
         self.grid_prices = self.calculate_grid_prices()
@@ -130,9 +265,18 @@ class GridTrader:
         self.print_grid_info()
         
     def signal_handler(self, signum, frame):
-        """处理退出信号"""
-        logger.info("\n收到退出信号，正在关闭...")
+        """
+        处理退出信号
+        信号处理函数可能打断持有锁的主线程，因此这里只设置退出标志（不记录日志、不获取锁），
+        等下单线程池结束后由 run() 撤单并退出
+        """
+        self._stop_requested = True
+
+    def shutdown(self):
+        """撤销所有未完成订单并打印最终状态"""
         try:
+            # 退出前必须基于最新的未完成订单撤单
+            self._open_orders_cache = (0.0, None)
             # 取消所有未完成订单
             self.cancel_all_orders()
             # 打印最终状态
@@ -140,8 +284,6 @@ class GridTrader:
             logger.info("程序已安全退出")
         except Exception as e:
             logger.error(f"退出时发生错误: {e}")
-        finally:
-            sys.exit(0)
 
     def print_grid_info(self):
         """打印网格信息"""
@@ -156,37 +298,30 @@ class GridTrader:
         
         # 获取并显示账户余额
         try:
-            balance = self.exchange.fetch_balance()
-            # 从交易对中获取基础货币和计价货币
-            try:
-                base_currency, quote_currency = self.symbol.split('_')
-            except ValueError:
-                logger.error(f"交易对格式错误: {self.symbol}，应为 BASE_QUOTE 格式")
-                return
-            
-            base_balance = float(balance.get(base_currency, {}).get('free', 0))
-            quote_balance = float(balance.get(quote_currency, {}).get('free', 0))
-            logger.info(f"当前{base_currency}余额: {base_balance:.3f}")
-            logger.info(f"当前{quote_currency}余额: {quote_balance:.2f}")
+            balance = self._get_balance()
+            base_balance = float(balance.get(self.base_currency, {}).get('free', 0))
+            quote_balance = float(balance.get(self.quote_currency, {}).get('free', 0))
+            logger.info(f"当前{self.base_currency}余额: {base_balance:.3f}")
+            logger.info(f"当前{self.quote_currency}余额: {quote_balance:.2f}")
         except Exception as e:
             logger.error(f"获取余额错误: {e}")
         
         logger.info("\n=== 网格列表 ===")
         
-        # 计算每个网格的投资金额
-        grid_investment = self.investment / self.grid_number
+        # 计算每个网格的投入和收益
+        investments, profits, profit_percentages = _compute_grid_returns(self._grid_prices_np, self._amounts)
         
-        for i in range(len(self.grid_prices) - 1):
-            buy_price = self.grid_prices[i]
-            sell_price = self.grid_prices[i + 1]
-            amount = self.get_order_amount(buy_price)
-            investment = amount * buy_price
-            profit = amount * (sell_price - buy_price)
-            profit_percentage = (profit / investment) * 100
-            
-            logger.info(f"网格 {i+1}: {buy_price:.2f} -> {sell_price:.2f} | "
-                       f"投入: {investment:.2f} | "
-                       f"收益: {profit:.2f} ({profit_percentage:.2f}%)")
+        # 合并为一条日志输出，避免逐行写入；日志级别高于 INFO 时跳过格式化
+        if logger.isEnabledFor(logging.INFO):
+            rows = [
+                f"网格 {i+1}: {buy_price:.2f} -> {sell_price:.2f} | "
+                f"投入: {investment:.2f} | "
+                f"收益: {profit:.2f} ({profit_percentage:.2f}%)"
+                for i, (buy_price, sell_price, investment, profit, profit_percentage) in enumerate(
+                    zip(self.grid_prices[:-1], self.grid_prices[1:], investments, profits, profit_percentages)
+                )
+            ]
+            logger.info("\n".join(rows))
         
         logger.info("\n=== 风险提示 ===")
         logger.info(f"最小订单数量: {self.min_order_size}")
@@ -195,51 +330,83 @@ class GridTrader:
         logger.info("=" * 50 + "\n")
 
     def calculate_grid_prices(self) -> List[float]:
-        """计算网格价格"""
-        prices = []
-        if self.grid_type == 'arithmetic':
-            # 等差网格
-            step = (self.upper_price - self.lower_price) / self.grid_number
-            for i in range(self.grid_number + 1):
-                price = self.lower_price + step * i
-                prices.append(round(price, 2))
-        else:
-            # 等比网格
-            ratio = (self.upper_price / self.lower_price) ** (1.0 / self.grid_number)
-            for i in range(self.grid_number + 1):
-                price = self.lower_price * (ratio ** i)
-                prices.append(round(price, 2))
-        return prices
+        """计算网格价格，同时计算每个网格的订单数量"""
+        # 等差网格或等比网格，保留数组形式供后续向量化计算使用
+        self._grid_prices_np, self._amounts = _compute_grid(
+            self.lower_price, self.upper_price, self.grid_number,
+            self.grid_type != 'arithmetic', self.investment, self.min_order_size
+        )
+        # 预先生成下单用的价格和数量字符串，下单时按索引直接取用
+        # 价格已保留两位小数；数量可能取 min_order_size，精度不固定，沿用 str() 的最短表示
+        self._price_strs = [f"{p:.2f}" for p in self._grid_prices_np]
+        self._amount_strs = [str(a) for a in self._amounts.tolist()]
+        return self._grid_prices_np.tolist()
+
+    def _get_balance(self, max_age: float = 0.5) -> Dict:
+        """获取账户余额，max_age 秒内复用缓存结果"""
+        cached_at, balance = self._balance_cache
+        now = time.monotonic()
+        if balance is not None and now - cached_at < max_age:
+            return balance
+        balance = self.exchange.fetch_balance()
+        self._balance_cache = (now, balance)
+        return balance
+
+    def invalidate_balance(self):
+        """使余额缓存失效"""
+        self._balance_cache = (0.0, None)
+
+    def _get_current_price(self, max_age: float = 0.2) -> float:
+        """获取当前价格，max_age 秒内复用缓存结果"""
+        cached_at, price = self._last_ticker
+        now = time.monotonic()
+        if price is not None and now - cached_at < max_age:
+            return price
+        ticker = self.exchange.fetch_ticker(self.symbol)
+        price = float(ticker['last'])
+        self._last_ticker = (now, price)
+        return price
+
+    def _get_open_orders(self) -> List[Dict]:
+        """获取未完成订单，半个检查间隔内复用缓存结果"""
+        cached_at, open_orders = self._open_orders_cache
+        now = time.monotonic()
+        if open_orders is not None and now - cached_at < self.check_interval / 2:
+            return open_orders
+        open_orders = self.exchange.fetch_open_orders(self.symbol)
+        self._open_orders_cache = (now, open_orders)
+        return open_orders
+
+    def get_order_amount_at_index(self, index: int) -> float:
+        """获取第 index 个网格价格对应的订单数量"""
+        return float(self._amounts[index])
 
     def get_order_amount(self, price: float) -> float:
-        """计算订单数量"""
+        """计算订单数量，价格位于网格上时直接使用预先计算的结果"""
+        index = int(np.searchsorted(self._grid_prices_np, price))
+        if index < len(self._grid_prices_np) and self._grid_prices_np[index] == price:
+            return float(self._amounts[index])
         grid_investment = self.investment / self.grid_number
         amount = grid_investment / price
         return max(round(amount, 3), self.min_order_size)
 
-    def check_balance(self, side: str, amount: float, price: float) -> bool:
-        """检查账户余额是否足够"""
+    def check_balance(self, side: str, amount: float, price: float, balance: Dict = None) -> bool:
+        """检查账户余额是否足够，未提供 balance 时获取当前余额"""
         try:
-            balance = self.exchange.fetch_balance()
-            # 从交易对中获取基础货币和计价货币
-            try:
-                base_currency, quote_currency = self.symbol.split('_')
-            except ValueError:
-                logger.error(f"交易对格式错误: {self.symbol}，应为 BASE_QUOTE 格式")
-                return False
-            
+            if balance is None:
+                balance = self._get_balance()
             if side == 'bid':
                 # 检查计价货币余额是否足够
                 required_quote = amount * price
-                quote_balance = float(balance.get(quote_currency, {}).get('free', 0))
+                quote_balance = float(balance.get(self.quote_currency, {}).get('free', 0))
                 if quote_balance < required_quote:
-                    logger.warning(f"{quote_currency}余额不足: 需要 {required_quote:.2f} {quote_currency}, 当前余额 {quote_balance:.2f} {quote_currency}")
+                    logger.warning(f"{self.quote_currency}余额不足: 需要 {required_quote:.2f} {self.quote_currency}, 当前余额 {quote_balance:.2f} {self.quote_currency}")
                     return False
             else:
                 # 检查基础货币余额是否足够
-                base_balance = float(balance.get(base_currency, {}).get('free', 0))
+                base_balance = float(balance.get(self.base_currency, {}).get('free', 0))
                 if base_balance < amount:
-                    logger.warning(f"{base_currency}余额不足: 需要 {amount:.3f} {base_currency}, 当前余额 {base_balance:.3f} {base_currency}")
+                    logger.warning(f"{self.base_currency}余额不足: 需要 {amount:.3f} {self.base_currency}, 当前余额 {base_balance:.3f} {self.base_currency}")
                     return False
             return True
         except Exception as e:
@@ -250,8 +417,7 @@ class GridTrader:
         """布置网格订单"""
         try:
             # 获取当前价格
-            ticker = self.exchange.fetch_ticker(self.symbol)
-            current_price = float(ticker['last'])
+            current_price = self._get_current_price(max_age=0)
             logger.info(f"当前价格: {current_price}")
 
             # 取消所有未完成的订单
@@ -263,42 +429,80 @@ class GridTrader:
             max_price = current_price * (1 + price_range)
 
 
-            # 在当前价格上下布置订单
-            for price in self.grid_prices:
-                # 只在下单价格在允许范围内时下单
-                if min_price <= price <= max_price:
-                    amount = self.get_order_amount(price)
-                    if price < current_price:
-                        logger.info(f"当前价格: {current_price}，下方布置买单{float(amount)} {float(price)}")
-                        if self.check_balance('bid', amount, price):
-                            self.place_order('bid', amount, price)
-                    elif price > current_price:
-                        logger.info(f"当前价格: {current_price}，上方布置卖单{float(amount)} {float(price)}")
-                        if self.check_balance('ask', amount, price):
-                            self.place_order('ask', amount, price)
-                else:
-                    logger.info(f"跳过价格 {float(price)}，超出允许范围 ({float(min_price):.2f} - {float(max_price):.2f})")
+            # 网格价格已排序，二分查找得到允许范围内的索引区间，并以当前价格分为买卖两段
+            # 等于当前价格的网格不下单
+            prices = self._grid_prices_np
+            lo = int(np.searchsorted(prices, min_price, side='left'))
+            hi = int(np.searchsorted(prices, max_price, side='right'))
+            split = int(np.searchsorted(prices, current_price, side='left'))
+            sell_start = int(np.searchsorted(prices, current_price, side='right'))
+            skipped = len(self.grid_prices) - (hi - lo)
+            if skipped:
+                logger.info(f"跳过 {skipped} 个价格，超出允许范围 ({float(min_price):.2f} - {float(max_price):.2f})")
+
+            # 获取一次余额快照，按计划下单的数量在本地扣减
+            balance = {currency: dict(info) for currency, info in self._get_balance().items()}
+
+            # 在当前价格上下确定需要布置的订单
+            tasks = []
+            for i in range(lo, split):
+                price = self.grid_prices[i]
+                amount = self.get_order_amount_at_index(i)
+                logger.info(f"当前价格: {current_price}，下方布置买单{float(amount)} {float(price)}")
+                if self.check_balance('bid', amount, price, balance):
+                    balance[self.quote_currency]['free'] -= amount * price
+                    tasks.append(('bid', i))
+            for i in range(sell_start, hi):
+                price = self.grid_prices[i]
+                amount = self.get_order_amount_at_index(i)
+                logger.info(f"当前价格: {current_price}，上方布置卖单{float(amount)} {float(price)}")
+                if self.check_balance('ask', amount, price, balance):
+                    balance[self.base_currency]['free'] -= amount
+                    tasks.append(('ask', i))
+
+            # 并发提交订单
+            if tasks:
+                executor = ThreadPoolExecutor(max_workers=4)
+                try:
+                    list(executor.map(lambda task: self._place_order_fast(*task, current_price), tasks))
+                finally:
+                    # 等待进行中的下单完成，未开始的任务直接取消
+                    executor.shutdown(wait=True, cancel_futures=True)
                 
         except Exception as e:
             logger.error(f"布置网格订单错误: {e}")
 
-    def place_order(self, side: str, amount: float, price: float):
-        """下单"""
+    def _place_order_fast(self, side: str, index: int, current_price: float):
+        """在已完成价格和余额检查后按网格索引下单，收到退出信号后不再提交"""
+        if self._stop_requested:
+            return None
+        return self.place_order(
+            side, self.get_order_amount_at_index(index), self.grid_prices[index], current_price,
+            price_str=self._price_strs[index], amount_str=self._amount_strs[index]
+        )
+
+    def place_order(self, side: str, amount: float, price: float, current_price: float = None,
+                    price_str: str = None, amount_str: str = None):
+        """
+        下单，current_price 未提供时使用缓存的最新价格
+        :param price_str: 预先格式化的价格字符串，未提供时使用 str(price)
+        :param amount_str: 预先格式化的数量字符串，未提供时使用 str(amount)
+        """
         try:
             # 获取当前价格
-            ticker = self.exchange.fetch_ticker(self.symbol)
-            current_price = float(ticker['last'])
+            if current_price is None:
+                current_price = self._get_current_price()
             
             # 检查是否会导致立即成交
             if side == 'bid':
                 # 买单价格必须低于当前价格
                 if price >= current_price:
-                    logger.warning(f"跳过可能导致立即成交的买单: {amount} @ {price} (当前价格: {current_price})")
+                    logger.warning("跳过可能导致立即成交的买单: %s @ %s (当前价格: %s)", amount, price, current_price)
                     return None
             else:  # ask
                 # 卖单价格必须高于当前价格
                 if price <= current_price:
-                    logger.warning(f"跳过可能导致立即成交的卖单: {amount} @ {price} (当前价格: {current_price})")
+                    logger.warning("跳过可能导致立即成交的卖单: %s @ %s (当前价格: %s)", amount, price, current_price)
                     return None
                 
             # 转换side参数为交易所需要的格式
@@ -309,18 +513,18 @@ class GridTrader:
                 'symbol': self.symbol,
                 'side': exchange_side,
                 'type': 'limit',  # 使用驼峰命名法
-                'amount': str(amount),  # 使用quantity而不是amount
-                'price': str(price),
+                'amount': amount_str if amount_str is not None else str(amount),  # 使用quantity而不是amount
+                'price': price_str if price_str is not None else str(price),
                 'post_only': True,  # 使用驼峰命名法
                 'time_in_force': 'GTC'
             }
             
             # 创建订单
-            logger.info(f"创建订单参数: {order_params}")
+            logger.info("创建订单参数: %s", order_params)
             order = self.exchange.create_order(**order_params)
             
             # 创建订单信息并添加到订单管理器
-            logger.info(f"订单信息: {order}")
+            logger.info("订单信息: %s", order)
             order_info = OrderInfo(
                 order_id=order['id'],
                 symbol=self.symbol,
@@ -328,95 +532,105 @@ class GridTrader:
                 price=float(price),  # 确保是float类型
                 amount=float(amount),  # 确保是float类型
                 status='open',
-                created_at=datetime.now()
+                created_at_ns=time.time_ns()
             )
-            logger.info(f"订单信息2: {order_info}")
+            logger.info("订单信息2: %s", order_info)
             self.order_manager.add_order(order_info)
+            self.invalidate_balance()
+            self._open_orders_cache = (0.0, None)
             
-            logger.info(f"下单成功: {side} {float(amount)} {self.symbol} @ {float(price)}")  # 使用float类型进行日志输出
+            logger.info("下单成功: %s %s %s @ %s", side, float(amount), self.symbol, float(price))  # 使用float类型进行日志输出
             return order
         except Exception as e:
-            logger.error(f"下单错误: {e}")
+            logger.error("下单错误: %s", e)
             return None
 
     def cancel_all_orders(self):
         """取消所有订单"""
         try:
-            open_orders = self.exchange.fetch_open_orders(self.symbol)
+            open_orders = self._get_open_orders()
             if not open_orders:
                 logger.info("没有未完成的订单")
                 return
                 
-            for order in open_orders:
-                if not order or 'id' not in order:
-                    logger.warning("跳过无效订单")
-                    continue
-                    
-                try:
+            # 并发提交撤单请求
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                futures = {}
+                for order in open_orders:
+                    if not order or 'id' not in order:
+                        logger.warning("跳过无效订单")
+                        continue
                     # 使用正确的cancel_order方法
-                    result = self.exchange.cancel_order(order['id'], self.symbol)
-                    if result:
-                        # 如果订单在我们的管理器中，更新状态
-                        if order['id'] in self.order_manager.orders:
-                            self.order_manager.update_order(order['id'], 'cancelled')
-                            logger.info(f"已取消订单 {order['id']}")
-                        else:
-                            logger.info(f"已取消外部订单 {order['id']}")
-                except Exception as e:
-                    logger.error(f"取消订单 {order['id']} 失败: {e}")
-                    continue
+                    futures[executor.submit(self.exchange.cancel_order, order['id'], self.symbol)] = order['id']
+                    
+                for future in as_completed(futures):
+                    order_id = futures[future]
+                    try:
+                        result = future.result()
+                        if result:
+                            self.invalidate_balance()
+                            self._open_orders_cache = (0.0, None)
+                            # 如果订单在我们的管理器中，更新状态
+                            if order_id in self.order_manager.orders:
+                                self.order_manager.update_order(order_id, 'cancelled')
+                                logger.info("已取消订单 %s", order_id)
+                            else:
+                                logger.info("已取消外部订单 %s", order_id)
+                    except Exception as e:
+                        logger.error("取消订单 %s 失败: %s", order_id, e)
+                        continue
                     
             logger.info("订单取消操作完成")
         except Exception as e:
-            logger.error(f"获取或取消订单时发生错误: {e}")
+            logger.error("获取或取消订单时发生错误: %s", e)
 
     def check_and_adjust_orders(self):
         """检查并调整订单"""
         try:
             # 获取当前价格和持仓
-            ticker = self.exchange.fetch_ticker(self.symbol)
-            current_price = float(ticker['last'])
+            current_price = self._get_current_price(max_age=0)
             
             # 获取账户余额
-            balance = self.exchange.fetch_balance()
-            base_currency, quote_currency = self.symbol.split('_')
-            base_balance = float(balance.get(base_currency, {}).get('free', 0))
+            balance = self._get_balance()
+            base_balance = float(balance.get(self.base_currency, {}).get('free', 0))
             
             # 检查是否触及止损或止盈
             if current_price <= self.stop_loss_price or current_price >= self.take_profit_price:
-                logger.warning(f"触及止损/止盈价格，停止交易: {current_price}")
+                logger.warning("触及止损/止盈价格，停止交易: %s", current_price)
                 self.cancel_all_orders()
                 return False
 
             # 获取未完成订单
-            open_orders = self.exchange.fetch_open_orders(self.symbol)
+            open_orders = self._get_open_orders()
             
-            # 更新订单状态
+            # 一次遍历完成买卖单分组和订单状态更新
+            buy_orders, sell_orders = [], []
             for order in open_orders:
-                if order['id'] in self.order_manager.orders:
-                    if order['status'] == 'closed':
-                        self.order_manager.update_order(
-                            order['id'],
-                            'closed',
-                            float(order.get('average', 0)),
-                            float(order.get('filled', 0))
-                        )
+                if order['side'] == 'Bid':
+                    buy_orders.append(order)
+                elif order['side'] == 'Ask':
+                    sell_orders.append(order)
+                if order['status'] == 'closed' and order['id'] in self.order_manager.orders:
+                    self.order_manager.update_order(
+                        order['id'],
+                        'closed',
+                        float(order.get('average', 0)),
+                        float(order.get('filled', 0))
+                    )
             
             # 根据基础货币余额决定是否需要调整订单
             if base_balance == 0:
                 # 没有基础货币，计算当前价格下方可以布置的买单数量
-                possible_buy_orders = len([price for price in self.grid_prices if price < current_price])
-                buy_orders = [order for order in open_orders if order['side'] == 'Bid']
+                possible_buy_orders = int(np.searchsorted(self._grid_prices_np, current_price, side='left'))
                 
                 if len(buy_orders) < possible_buy_orders:
-                    logger.info(f"{base_currency}余额为0，买单数量不足，重新布置网格。当前买单数量: {len(buy_orders)}，可布置买单数量: {possible_buy_orders}")
+                    logger.info("%s余额为0，买单数量不足，重新布置网格。当前买单数量: %d，可布置买单数量: %d", self.base_currency, len(buy_orders), possible_buy_orders)
                     self.place_grid_orders()
             else:
                 # 有基础货币，计算可用的卖单数量（考虑手续费）
                 fee_rate = 0.003  # 0.1% 手续费率
                 available_balance = base_balance * (1 - fee_rate)  # 考虑手续费后的可用余额
-                possible_sell_orders = len([price for price in self.grid_prices if price > current_price])
-                sell_orders = [order for order in open_orders if order['side'] == 'Ask']
+                possible_sell_orders = len(self._grid_prices_np) - int(np.searchsorted(self._grid_prices_np, current_price, side='right'))
                 
                 # 计算每个网格需要的数量
                 grid_amount = self.get_order_amount(current_price)
@@ -426,7 +640,7 @@ class GridTrader:
                 actual_possible_sell_orders = min(possible_sell_orders, max_possible_sell_orders)
                 
                 if len(sell_orders) < actual_possible_sell_orders:
-                    logger.info(f"卖单数量不足，重新布置网格。当前卖单数量: {len(sell_orders)}，可布置卖单数量: {actual_possible_sell_orders}，可用余额: {available_balance:.3f} {base_currency}")
+                    logger.info("卖单数量不足，重新布置网格。当前卖单数量: %d，可布置卖单数量: %d，可用余额: %.3f %s", len(sell_orders), actual_possible_sell_orders, available_balance, self.base_currency)
                     self.place_grid_orders()
                 
             # 打印订单汇总信息
@@ -435,7 +649,7 @@ class GridTrader:
             return True
 
         except Exception as e:
-            logger.error(f"检查订单错误: {e}")
+            logger.error("检查订单错误: %s", e)
             return True
 
     def run(self):
@@ -449,15 +663,30 @@ class GridTrader:
         # 初始布置网格
         self.place_grid_orders()
 
-        # 持续监控
-        while True:
+        # 持续监控，按固定节拍执行，检查耗时不会累积到检查间隔中
+        next_tick = time.monotonic()
+        while not self._stop_requested:
             try:
                 if not self.check_and_adjust_orders():
                     break
-                time.sleep(self.check_interval)
             except Exception as e:
                 logger.error(f"运行错误: {e}")
-                time.sleep(self.check_interval)
+            next_tick += self.check_interval
+            if next_tick <= time.monotonic():
+                # 检查耗时超过间隔，从当前时间重新计时
+                next_tick = time.monotonic()
+            # 分段休眠，收到退出信号后尽快结束等待
+            while not self._stop_requested:
+                sleep_for = next_tick - time.monotonic()
+                if sleep_for <= 0:
+                    break
+                time.sleep(min(sleep_for, 0.2))
+
+        # 收到退出信号：此时下单线程池已结束，可以安全撤单
+        if self._stop_requested:
+            logger.info("\n收到退出信号，正在关闭...")
+            self.shutdown()
+            sys.exit(0)
 
 if __name__ == "__main__":
     trader = GridTrader()
@@ -30,6 +30,10 @@ def main():
     })
     
     try:
+        # 获取账户余额（与交易对无关，只需获取一次）
+        balance = exchange.fetch_balance()
+        logger.info(f"账户余额: {balance}")
+        
         # 遍历交易对
         for pair in config['trading_pairs']:
             symbol = pair['symbol']
@@ -40,10 +44,6 @@ def main():
             ticker = exchange.fetch_ticker(symbol)
             logger.info(f"{symbol} 当前价格: {ticker['last']}")
             
-            # 获取账户余额
-            balance = exchange.fetch_balance()
-            logger.info(f"账户余额: {balance}")
-            
             # 创建订单
             order_params = config['order_params'].copy()
             order_params['symbol'] = symbol
@@ -64,11 +64,13 @@ def main():
             trades = exchange.fetch_my_trades(symbol)
             logger.info(f"最近的交易历史: {trades}")
 
+            # 按订单ID索引成交记录（倒序构建，保留每个订单的第一条成交）
+            trades_by_order = {trade['order']: trade for trade in reversed(trades)}
+            
             # 查找匹配的成交记录
-            for trade in trades:
-                if trade['symbol'] == symbol and trade['order'] == "114249091694002182":
-                    logger.info(f"找到匹配的成交记录: {trade}")
-                    break
+            match = trades_by_order.get("114249091694002182")
+            if match and match['symbol'] == symbol:
+                logger.info(f"找到匹配的成交记录: {match}")
             
             logger.info("-" * 50)
             